@@ -3,6 +3,8 @@ from itertools import islice
 from pathlib import Path
 from typing import Any, Iterable, Tuple
 
+import numpy as np
+
 
 def read_depths(path: Path) -> Iterable[int]:
     with open(path, "r") as f:
@@ -37,13 +39,28 @@ def window(seq: Iterable[Any], n: int = 2) -> Iterable[Tuple[Any]]:
         yield result
 
 
+def n_window_larger(depths: np.ndarray, n: int = 1) -> int:
+    """Returns # of sliding window (of width n) sums larger than the previous.
+
+    Consecutive windows share all but their first and last values so only
+    those need comparing.
+
+    Example:
+
+        >>> depths = np.array([199, 200, 208, 210, 200, 207, 240, 269, 260, 263])
+        >>> n_window_larger(depths), n_window_larger(depths, 3)
+        (7, 5)
+    """
+    return int(np.count_nonzero(depths[n:] > depths[:-n]))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("file", type=Path)
     args = parser.parse_args()
 
-    print(f"part 1: {n_larger(read_depths(args.file))}")
+    depths = np.loadtxt(args.file, dtype=np.int32, ndmin=1)
 
-    smoothed = [sum(w) for w in window(read_depths(args.file), 3)]
+    print(f"part 1: {n_window_larger(depths)}")
 
-    print(f"part 2: {n_larger(smoothed)}")
\ No newline at end of file
+    print(f"part 2: {n_window_larger(depths, 3)}")
\ No newline at end of file
@@ -1,58 +1,77 @@
 import argparse
-from typing import List
+from array import array
+from typing import Dict
 
 
-PART1_SCORES = {")": 3, "]": 57, "}": 1197, ">": 25137}
-PART2_SCORES = {")": 1, "]": 2, "}": 3, ">": 4}
-OPEN = set("([{<")
-CLOSE = set(")]}>")
-TO_CLOSE = dict(zip("([{<", ")]}>"))
+def byte_table(values: Dict[str, int]) -> array:
+    """Returns a 256 entry table mapping each byte to its value, or 0.
+
+    Example:
+
+        >>> table = byte_table({"a": 1})
+        >>> len(table), table[ord("a")], table[ord("b")]
+        (256, 1, 0)
+    """
+    table = array('i', [0]) * 256
+    for c, v in values.items():
+        table[ord(c)] = v
+    return table
+
+
+PART1_SCORES = byte_table({")": 3, "]": 57, "}": 1197, ">": 25137})
+PART2_SCORES = byte_table({")": 1, "]": 2, "}": 3, ">": 4})
+CLOSE_OF = byte_table({o: ord(c) for o, c in zip("([{<", ")]}>")})
+IS_CLOSE = byte_table(dict.fromkeys(")]}>", 1))
 
 
 class Incomplete(Exception):
-    def __init__(self, to_complete: List[str]):
+    def __init__(self, to_complete: bytes):
         self.to_complete = to_complete
 
 
 class Corrupt(Exception):
-    def __init__(self, wrong_close: str):
+    def __init__(self, wrong_close: int):
         self.wrong_close = wrong_close
 
+    def __str__(self) -> str:
+        return chr(self.wrong_close)
+
 
-def check_line(line: str) -> None:
+def check_line(line: bytes) -> None:
     """Raises a Incomplete/Corrupt error if line incomplete/correct.
     
     Examples:
 
-        >>> line = '[<>({}){}[([])<>]]'
+        >>> line = b'[<>({}){}[([])<>]]'
         >>> check_line(line)
 
-        >>> line = '([<>]'
+        >>> line = b'([<>]'
         >>> check_line(line)
         Traceback (most recent call last):
         ...
-        main.Incomplete: [')']
+        main.Incomplete: b')'
 
-        >>> line = '{([(<{}[<>[]}>{[]{[(<()>'
+        >>> line = b'{([(<{}[<>[]}>{[]{[(<()>'
         >>> check_line(line)
         Traceback (most recent call last):
         ...
         main.Corrupt: }
     """
-    stack = []
+    stack = bytearray()
     for c in line:
-        if c in OPEN:
-            stack.append(TO_CLOSE[c])
-        elif c in CLOSE:
-            if c == stack[-1]:
+        close = CLOSE_OF[c]
+        if close:
+            stack.append(close)
+        elif IS_CLOSE[c]:
+            if stack and c == stack[-1]:
                 stack.pop()
             else:
                 raise Corrupt(c)
     if len(stack) > 0:
-        raise Incomplete(stack[::-1])
+        raise Incomplete(bytes(stack[::-1]))
         
 
-def complete_score(to_complete: List[str]) -> int:
+def complete_score(to_complete: bytes) -> int:
     score = 0
     for c in to_complete:
         score = score*5 + PART2_SCORES[c]    
@@ -66,9 +85,9 @@ if __name__ == "__main__":
 
     part1_scores = []
     part2_scores = []
-    with open(args.path, 'r') as f:
+    with open(args.path, 'rb') as f:
         for line in f:
-            line = line.strip()
+            line = line.rstrip(b"\r\n")
             try:
                 check_line(line)
             except Corrupt as err:
@@ -78,4 +97,4 @@ if __name__ == "__main__":
                                     
     print(sum(part1_scores))
     
-    print(sorted(part2_scores)[len(part2_scores) // 2])
\ No newline at end of file
+    print(sorted(part2_scores)[len(part2_scores) // 2])
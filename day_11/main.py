@@ -1,92 +1,62 @@
 import argparse
-from collections import defaultdict
-from collections import namedtuple
-from typing import Iterable
 from typing import List
-from typing import Set
-
-
-Position = namedtuple("Position", ['x', 'y'])
-
-
-class State:
-    def __init__(self, xmax, ymax):
-        self.xmax = xmax
-        self.ymax = ymax
-        self.energy_positions = defaultdict(set)
-        self.positions_energy = dict()
-
-    def set_energy(self, position: Position, energy_level: int) -> None:
-        if position in self.positions_energy:
-            prev_energy = self.positions_energy[position]
-            self.energy_positions[prev_energy].remove(position)
-        self.energy_positions[energy_level].add(position)
-        self.positions_energy[position] = energy_level
-        
-    def get_energy(self, position: Position) -> int:
-        return self.positions_energy[position]
-        
-    def get_positions(self, energy_level: int) -> Set[Position]:
-        return self.energy_positions[energy_level]
-        
-    def get_energy_levels(self) -> List[int]:
-        return [k for k, v in self.energy_positions.items() if len(v) > 0]
-        
-    def pop_last(self, energy_level: int) -> Position:
-        pos = self.energy_positions[energy_level].pop()
-        del self.positions_energy[pos]
-        return pos
-        
-    def __iter__(self):
-        # copy to allow writes during iteration
-        p_e = dict(self.positions_energy)   
-        for position, energy in p_e.items():
-            yield position, energy
-            
-    def step(self) -> int:
-        """Returns the # of flashes after stepping state."""
-        for position, energy_level in self:
-            self.set_energy(position, energy_level + 1)
-        
-        flashed = set()
-        while len(self.get_positions(energy_level=10)) > 0:
-            flash = self.pop_last(energy_level=10)
-            if flash in flashed:
-                self.set_energy(flash, 10)
-                continue
-            self.set_energy(flash, 0)
-            flashed.add(flash)
-            for neighbour in neighbours(flash, self.xmax, self.ymax):
-                if neighbour in flashed:
-                    continue
-                self.set_energy(neighbour, min(10, self.get_energy(neighbour) + 1))
-        return len(flashed)
-        
-    def __repr__(self) -> str:
-        r = []
-        for y in range(self.ymax):
-            for x in range(self.xmax):
-                r.append(str(self.get_energy(Position(x, y))))
-            r.append('\n')
-        return ''.join(r)
-
-
-def parse_input(data: List[str]) -> State:
-    r"""Returns the State parsed from data."""
-    state = State(xmax=len(data), ymax=len(data[0].strip()))
-    for y, line in enumerate(data):
-        for x, c in enumerate(line.strip()):
-            state.set_energy(Position(x, y), int(c))
-    return state
-    
 
-def neighbours(position: Position, xmax: int, ymax: int) -> Iterable[Position]:
-    for dx in [-1, 0, 1]:
-        for dy in [-1, 0, 1]:
-            nx, ny = position.x + dx, position.y + dy
-            if nx >= xmax or nx < 0 or ny >= ymax or ny < 0:
+import numpy as np
+from numba import njit
+
+
+FLASHED = -1
+OFFSETS = tuple(
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)
+)
+
+
+@njit(cache=True)
+def step(grid: np.ndarray) -> int:
+    """Returns the # of flashes after stepping grid (in place).
+
+    grid must be C contiguous.
+    """
+    height, width = grid.shape
+    flat = grid.reshape(-1)   # view of grid
+    # each octopus is pushed at most once, when its energy reaches 10
+    to_flash = np.empty(flat.size, dtype=np.int32)
+
+    flat += 1
+    ready = np.flatnonzero(flat > 9)
+    n = ready.size
+    to_flash[:n] = ready
+
+    while n > 0:
+        n -= 1
+        y, x = divmod(to_flash[n], width)
+        grid[y, x] = FLASHED
+        for dx, dy in OFFSETS:
+            nx, ny = x + dx, y + dy
+            if nx >= width or nx < 0 or ny >= height or ny < 0:
+                continue
+            if grid[ny, nx] == FLASHED:
                 continue
-            yield Position(nx, ny)
+            grid[ny, nx] += 1
+            if grid[ny, nx] == 10:
+                to_flash[n] = ny * width + nx
+                n += 1
+
+    flashed = flat == FLASHED
+    flat[flashed] = 0
+    return flashed.sum()
+
+
+def parse_input(data: List[str]) -> np.ndarray:
+    r"""Returns the grid of energy levels parsed from data.
+
+    Example:
+
+        >>> parse_input(['5483', '2745'])
+        array([[5, 4, 8, 3],
+               [2, 7, 4, 5]], dtype=int8)
+    """
+    return np.array([[int(c) for c in line.strip()] for line in data], dtype=np.int8)
     
 
 if __name__ == "__main__":
@@ -95,17 +65,17 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     with open(args.path, 'r') as f:
-        state = parse_input(f.readlines())
+        grid = parse_input(f.readlines())
 
     total_flashes = 0
     sync_step = 0
-    step = 0
-    while sync_step == 0 or step < 100:
-        total_flashes += state.step()
-        step += 1
-        if step == 100:
+    n_steps = 0
+    while sync_step == 0 or n_steps < 100:
+        total_flashes += step(grid)
+        n_steps += 1
+        if n_steps == 100:
             print(total_flashes)
-        if len(state.get_energy_levels()) == 1:
-            sync_step = step
+        if grid.min() == grid.max():
+            sync_step = n_steps
 
-    print(sync_step) 
\ No newline at end of file
+    print(sync_step) 
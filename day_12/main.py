@@ -1,15 +1,14 @@
 import argparse
 import re
-from collections import defaultdict
-from copy import copy
-from typing import Callable
-from typing import Dict
+from collections import namedtuple
+from functools import lru_cache
 from typing import Iterable
 from typing import List
 
 
-Node = str
-Graph = Dict[Node, Node]
+Node = int
+# nodes are numbered 0..n-1 in the order they're first seen
+Graph = namedtuple("Graph", ["names", "adj", "is_small", "start", "end"])
 
 
 def parse_input(data: Iterable[str]) -> Graph:
@@ -25,39 +24,48 @@ def parse_input(data: Iterable[str]) -> Graph:
         ... A-end
         ... b-end'''.split('\n')
         >>> graph = parse_input(data)
-        >>> sorted(list(graph.keys()))
+        >>> sorted(graph.names)
         ['A', 'b', 'c', 'd', 'end', 'start']
-        >>> sorted(list(graph["start"]))
+        >>> sorted([graph.names[n] for n in graph.adj[graph.start]])
         ['A', 'b']
-        >>> sorted(list(graph["b"]))
-        ['A', 'd', 'end', 'start']
+        >>> b = graph.names.index("b")
+        >>> sorted([graph.names[n] for n in graph.adj[b]])
+        ['A', 'd', 'end']
+        >>> graph.is_small[b]
+        True
     """
     pattern = re.compile("([a-zA-Z]+)-([a-zA-Z]+)")
-    graph = defaultdict(set)
+    ids = {}
+    adj = []
     for line in data:
         match = pattern.fullmatch(line.rstrip())
         if not match:
             raise ValueError(f"unable to parse line {repr(line)}")
+        a, b = [ids.setdefault(name, len(ids)) for name in match.groups()]
+        while len(adj) < len(ids):
+            adj.append([])
         # undirected so add both directions
-        graph[match[1]].add(match[2])
-        graph[match[2]].add(match[1])
-    return graph
-    
-
-def part1_skip_next(next: Node, lower_cnts: Dict[Node, int]) -> bool:
-    return next.islower() and lower_cnts[next] == 1
-
-
-def part2_skip_next(next: Node, lower_cnts: Dict[Node, int]) -> bool:
-    return next.islower() and (
-        (lower_cnts[next] == 2) or 
-        (lower_cnts[next] == 1 and any([v == 2 for v in lower_cnts.values()]))
+        if b not in adj[a]:
+            adj[a].append(b)
+            adj[b].append(a)
+    names = list(ids)
+    start = ids["start"]
+    return Graph(
+        names=names,
+        # paths never return to start so drop it as a neighbour up front
+        adj=[[n for n in ns if n != start] for ns in adj],
+        is_small=[name.islower() for name in names],
+        start=start,
+        end=ids["end"]
     )
 
 
-def paths(graph: Graph, skip_next: Callable[[Node, Dict[Node, int]], bool]) -> List[List[Node]]:
+def paths(graph: Graph, allow_twice: bool) -> List[List[str]]:
     r"""Returns paths.
 
+    Small caves are visited at most once, except that a single small cave
+    may be visited twice per path if allow_twice is set.
+
     Example:
 
         >>> data = '''start-A
@@ -68,7 +76,7 @@ def paths(graph: Graph, skip_next: Callable[[Node, Dict[Node, int]], bool]) -> L
         ... A-end
         ... b-end'''.split('\n')
         >>> graph = parse_input(data)
-        >>> for p in sorted(list(paths(graph, part1_skip_next))):
+        >>> for p in sorted(list(paths(graph, allow_twice=False))):
         ...     print(p)
         ['start', 'A', 'b', 'A', 'c', 'A', 'end']
         ['start', 'A', 'b', 'A', 'end']
@@ -80,30 +88,67 @@ def paths(graph: Graph, skip_next: Callable[[Node, Dict[Node, int]], bool]) -> L
         ['start', 'b', 'A', 'c', 'A', 'end']
         ['start', 'b', 'A', 'end']
         ['start', 'b', 'end']
-        >>> print(len(paths(graph, part2_skip_next)))
+        >>> print(len(paths(graph, allow_twice=True)))
         36
     """
-    stack = [('start', ['start'], defaultdict(int))]
+    # visited is a bitmask of the small caves on the path so far
+    stack = [(graph.start, [graph.start], 1 << graph.start, not allow_twice)]
     paths = []
     while stack:
-        node, path, lower_cnts = stack.pop()
-        if node == 'end':
-            paths.append(list(path))
+        node, path, visited, used_twice = stack.pop()
+        if node == graph.end:
+            paths.append([graph.names[n] for n in path])
             continue
             
-        for next in graph[node]:
-            if next == 'start':
-                continue   # prevent infinite loops
-            elif next != 'end' and skip_next(next, lower_cnts):
-                continue
-            if next != 'end' and next.islower():
-                next_lower_cnts = copy(lower_cnts)
-                next_lower_cnts[next] += 1
-            else:
-                next_lower_cnts = lower_cnts
-            stack.append((next, list(path) + [next], next_lower_cnts))
+        for next in graph.adj[node]:
+            bit = 1 << next
+            if not graph.is_small[next]:
+                stack.append((next, path + [next], visited, used_twice))
+            elif not visited & bit:
+                stack.append((next, path + [next], visited | bit, used_twice))
+            elif not used_twice:
+                stack.append((next, path + [next], visited, True))
             
     return paths
+
+
+def count_paths(graph: Graph, allow_twice: bool) -> int:
+    r"""Returns the number of paths, without building each path.
+
+    Large caves can be revisited freely, so the number of ways to reach
+    the end from a node depends only on the node, the small caves visited
+    so far and whether the double visit has been used. These counts are
+    memoized.
+
+    Example:
+
+        >>> data = '''start-A
+        ... start-b
+        ... A-c
+        ... A-b
+        ... b-d
+        ... A-end
+        ... b-end'''.split('\n')
+        >>> graph = parse_input(data)
+        >>> count_paths(graph, allow_twice=False), count_paths(graph, allow_twice=True)
+        (10, 36)
+    """
+    @lru_cache(maxsize=None)
+    def count_from(node: Node, visited: int, used_twice: bool) -> int:
+        if node == graph.end:
+            return 1
+        n = 0
+        for next in graph.adj[node]:
+            bit = 1 << next
+            if not graph.is_small[next]:
+                n += count_from(next, visited, used_twice)
+            elif not visited & bit:
+                n += count_from(next, visited | bit, used_twice)
+            elif not used_twice:
+                n += count_from(next, visited, True)
+        return n
+
+    return count_from(graph.start, 1 << graph.start, not allow_twice)
     
 
 if __name__ == "__main__":
@@ -115,11 +160,10 @@ if __name__ == "__main__":
     with open(args.path, 'r') as f:
         graph = parse_input(f)
 
-    for fn in [part1_skip_next, part2_skip_next]:
-        ps = paths(graph, fn)
+    for allow_twice in [False, True]:
         if args.debug:
-            for p in sorted(list(ps)):
+            for p in sorted(paths(graph, allow_twice)):
                 print(p)
             print()
         else:
-            print(len(ps))
\ No newline at end of file
+            print(count_paths(graph, allow_twice))
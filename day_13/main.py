@@ -3,12 +3,12 @@ import re
 from collections import namedtuple
 from typing import Iterable
 from typing import List
-from typing import Set
 from typing import Tuple
 
+import numpy as np
 
-Coord = namedtuple("Coord", ['x', 'y'])
-Dots = Set[Coord]
+
+Dots = np.ndarray   # (N, 2) array of (x, y)
 Fold = namedtuple("Fold", ['axis', 'line'])
 
 
@@ -24,17 +24,16 @@ def parse_input(data: Iterable[str]) -> Tuple[Dots, List[Fold]]:
         ... fold along y=7
         ... fold along x=5'''.split('\n')
         >>> dots, folds = parse_input(iter(data))
-        >>> expected = {
-        ...     Coord(x, y) for x, y in [(6, 10), (0, 2), (9, 3)]
-        ... }
-        >>> expected == dots
-        True
+        >>> dots
+        array([[ 6, 10],
+               [ 0,  2],
+               [ 9,  3]], dtype=int32)
         >>> folds == [Fold('y', 7), Fold('x', 5)]
         True
     """ 
     coord_pattern = re.compile("(\d+),(\d+)")
     fold_pattern = re.compile("fold along ([xy])=(\d+)")
-    dots = set()
+    dots = []
     folds = []
     while True:
         line = next(data).rstrip()
@@ -43,7 +42,7 @@ def parse_input(data: Iterable[str]) -> Tuple[Dots, List[Fold]]:
         match = coord_pattern.fullmatch(line)
         if not match:
             raise ValueError(f"unknown line {line}")
-        dots.add(Coord(int(match[1]), int(match[2])))
+        dots.append((int(match[1]), int(match[2])))
         
     for line in data:
         match = fold_pattern.fullmatch(line.rstrip())
@@ -51,11 +50,11 @@ def parse_input(data: Iterable[str]) -> Tuple[Dots, List[Fold]]:
             raise ValueError(f"unknown line {line}")
         folds.append(Fold(match[1], int(match[2])))
         
-    return dots, folds
+    return np.array(dots, dtype=np.int32).reshape(-1, 2), folds
 
 
 def fold(dots: Dots, fold: Fold) -> Dots:
-    r"""Returns dots after performing fold.
+    r"""Returns the unique dots after performing fold.
     
     Example:
     
@@ -69,33 +68,34 @@ def fold(dots: Dots, fold: Fold) -> Dots:
         >>> print(folds)
         [Fold(axis='y', line=1), Fold(axis='x', line=1)]
         >>> dots = fold(dots, folds[0])
-        >>> dots == {Coord(0, 0), Coord(1, 0), Coord(2, 1)}
-        True
+        >>> dots.tolist()
+        [[0, 0], [1, 0], [2, 1]]
         >>> dots = fold(dots, folds[1])
-        >>> dots == {Coord(0, 0), Coord(1, 0), Coord(0, 1)}
-        True
+        >>> dots.tolist()
+        [[0, 0], [0, 1], [1, 0]]
     """
-    new_dots = set()
-    for dot in dots:
-        x, y = dot.x, dot.y
-        if fold.axis == 'x' and x > fold.line:
-            x = fold.line - (dot.x - fold.line)
-        elif fold.axis == 'y' and y > fold.line:
-            y = fold.line - (dot.y - fold.line)
-        new_dots.add(Coord(x, y))
-    return new_dots
+    col = 0 if fold.axis == 'x' else 1
+    dots = dots.copy()
+    vals = dots[:, col]
+    dots[:, col] = np.where(vals > fold.line, 2*fold.line - vals, vals)
+    return np.unique(dots, axis=0)
     
 
 def display(dots: Dots) -> None:
-    max_x = max([d.x for d in dots])
-    max_y = max([d.y for d in dots])
-    for y in range(max_y + 1):
-        for x in range(max_x + 1):
-            if Coord(x, y) in dots:
-                print('#', end='')
-            else:
-                print('.', end='')
-        print()
+    r"""Prints dots as a grid of '#'s.
+
+    Example:
+
+        >>> display(np.array([[0, 0], [2, 1]]))
+        #..
+        ..#
+    """
+    max_x, max_y = dots.max(axis=0)
+    # extra column holds the newlines
+    grid = np.full((max_y + 1, max_x + 2), ord('.'), dtype=np.uint8)
+    grid[:, -1] = ord('\n')
+    grid[dots[:, 1], dots[:, 0]] = ord('#')
+    print(grid.tobytes().decode("ascii"), end='')
         
 
 if __name__ == "__main__":
@@ -111,4 +111,4 @@ if __name__ == "__main__":
         if i == 0:
             print(f"part 1: {len(dots)}")
             
-    display(dots)
\ No newline at end of file
+    display(dots)
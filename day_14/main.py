@@ -10,11 +10,29 @@ The result being that we can just keep a count of the current pairings and apply
 """
 import argparse
 import re
-from collections import Counter
+from string import ascii_uppercase
 from typing import Dict
 from typing import Iterable
 from typing import Tuple
 
+import numpy as np
+from numba import njit
+
+
+# pair counts are kept in a vector indexed by the pair's base-26 value
+PAIRS = [a + b for a in ascii_uppercase for b in ascii_uppercase]
+
+
+def pair_id(pair: str) -> int:
+    """Returns the index of pair in PAIRS.
+
+    Example:
+
+        >>> pair_id("AA"), pair_id("AZ"), pair_id("BA")
+        (0, 25, 26)
+    """
+    return (ord(pair[0]) - ord("A")) * 26 + (ord(pair[1]) - ord("A"))
+
 
 def parse_input(data: Iterable[str]) -> Tuple[str, Dict]:
     r"""Returns the polymer template and pair insertion rules.
@@ -44,8 +62,29 @@ def parse_input(data: Iterable[str]) -> Tuple[str, Dict]:
     return template, rules
 
 
-def pair_insertion(template: str, rules: Dict[str, str], iterations: int) -> Dict[str, int]:
-    r"""Returns a map of (pair, count) after iterations.
+@njit(cache=True)
+def _pair_insertion(pair_cnts, chr_cnts, rule_mid, new_left, new_right, iterations):
+    for _ in range(iterations):
+        new_pair_cnts = np.zeros_like(pair_cnts)
+        for pair in range(pair_cnts.size):
+            count = pair_cnts[pair]
+            if count == 0:
+                continue
+            if rule_mid[pair] < 0:
+                raise ValueError("no insertion rule for pair")
+            chr_cnts[rule_mid[pair]] += count
+            new_pair_cnts[new_left[pair]] += count
+            new_pair_cnts[new_right[pair]] += count
+        pair_cnts = new_pair_cnts
+    return pair_cnts
+
+
+def pair_insertion(template: str, rules: Dict[str, str], iterations: int) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Returns the (pair, character) count vectors after iterations.
+
+    Pair counts are indexed by pair_id and character counts by letter,
+    A=0 to Z=25. Counts are int64, or Python ints (object dtype) when
+    iterations is large enough that they could overflow int64.
     
     Example:
 
@@ -68,26 +107,41 @@ def pair_insertion(template: str, rules: Dict[str, str], iterations: int) -> Dic
         ... CC -> N
         ... CN -> C'''.split('\n')))
         >>> exp_pair = sorted([('NC', 1), ('CN', 1), ('NB', 1), ('BC', 1), ('CH', 1), ('HB', 1)])
-        >>> exp_chr = sorted(list(Counter("NCNBCHB").items()))
+        >>> exp_chr = sorted([('B', 2), ('C', 2), ('H', 1), ('N', 2)])
         >>> pair, chr = pair_insertion(template, rules, 1)
-        >>> exp_pair == sorted(list(pair.items()))
+        >>> exp_pair == [(PAIRS[i], c) for i, c in enumerate(pair.tolist()) if c]
         True
-        >>> exp_chr == sorted(list(chr.items()))
+        >>> exp_chr == [(ascii_uppercase[i], c) for i, c in enumerate(chr.tolist()) if c]
         True
+        >>> _, chr = pair_insertion(template, rules, 70)
+        >>> chr.dtype, max(chr) - min(c for c in chr if c)
+        (dtype('O'), 2360951043112524598468)
     """
-    pair_cnts = Counter([a + b for a, b in zip(template, template[1:])])
-    chr_cnts = Counter(template)
-    
-    for i in range(iterations):
-        new_pair_cnts = Counter()
-        for pair, count in pair_cnts.items():
-            new_chr = rules[pair]
-            chr_cnts[new_chr] += count
-            new_pair_cnts[pair[0] + new_chr] += count
-            new_pair_cnts[new_chr + pair[1]] += count
-        pair_cnts = new_pair_cnts
-            
-    return dict(pair_cnts), dict(chr_cnts)
+    # rule "AB -> C" maps pair AB to the pairs AC and CB
+    rule_mid = np.full(len(PAIRS), -1, dtype=np.int8)
+    new_left = np.zeros(len(PAIRS), dtype=np.int32)
+    new_right = np.zeros(len(PAIRS), dtype=np.int32)
+    for pair, new_chr in rules.items():
+        i = pair_id(pair)
+        rule_mid[i] = ord(new_chr) - ord("A")
+        new_left[i] = pair_id(pair[0] + new_chr)
+        new_right[i] = pair_id(new_chr + pair[1])
+
+    chrs = np.frombuffer(template.encode(), dtype=np.uint8) - ord("A")
+    pair_ids = chrs[:-1].astype(np.int32) * 26 + chrs[1:]
+    pair_cnts = np.bincount(pair_ids, minlength=len(PAIRS)).astype(np.int64)
+    chr_cnts = np.bincount(chrs, minlength=len(ascii_uppercase)).astype(np.int64)
+
+    # no count can exceed the final polymer length, below len(template) * 2**iterations,
+    # past int64's range run the same loop in Python over Python ints instead
+    if len(template) << iterations <= np.iinfo(np.int64).max:
+        insertion = _pair_insertion
+    else:
+        insertion = _pair_insertion.py_func
+        pair_cnts, chr_cnts = pair_cnts.astype(object), chr_cnts.astype(object)
+
+    pair_cnts = insertion(pair_cnts, chr_cnts, rule_mid, new_left, new_right, iterations)
+    return pair_cnts, chr_cnts
     
 
 if __name__ == "__main__":
@@ -100,8 +154,5 @@ if __name__ == "__main__":
         template, rules = parse_input(f)
 
     pair_cnts, chr_cnts = pair_insertion(template, rules, args.iters)
-    
-    most = max(chr_cnts.items(), key=lambda c: c[1])
-    least = min(chr_cnts.items(), key=lambda c: c[1])
 
-    print(most[1] - least[1])
\ No newline at end of file
+    print(np.ptp(chr_cnts[chr_cnts > 0]))
\ No newline at end of file
@@ -1,233 +1,160 @@
 """
 Dijkstra's algorithm!
 
-Pythons heap misses the change operation so lets write our own for fun.
+Pythons heap misses the change operation so the first version of this wrote its own. It turns out we don't need it: push a new entry whenever a shorter path is found and skip any stale entries as they're popped (lazy deletion).
 
-On reflection you could probably dynamically generate the grid when searching to speed things up but it's working and correct so moving on.
+The search itself is compiled with Numba and runs over a flat array-backed 4-ary heap (half the depth of a binary heap, and sibling keys share a cache line), with the grid (including the 5x tiled version) materialised up front as an int8 array.
+
+Every step costs at least 1 so the Manhattan distance to the end never overestimates the remaining risk. Using it as an A* heuristic keeps the result optimal while steering the search towards the end, rather than expanding nearly the whole grid.
 """
 import argparse
-from collections import namedtuple
-from copy import copy
-from typing import Hashable
-from typing import Iterable
-from typing import List
-
+from typing import Tuple
 
-Position = namedtuple("Position", ['x', 'y'])
+import numpy as np
+from numba import njit
 
 
-class Grid:
-    def __init__(self, grid: List[List[int]], n: int = 1):
-        self.grid = grid
-        self.n = n
+Position = Tuple[int, int]   # (x, y)
 
-    @property
-    def maxx(self) -> int:
-        return self.n*len(self.grid[0]) - 1
+_INF = np.iinfo(np.int32).max
 
-    @property
-    def maxy(self) -> int:
-        return self.n*len(self.grid) - 1
-        
-    def __getitem__(self, pos: Position) -> int:
-        assert pos.x < self.n * len(self.grid[0])
-        assert pos.y < self.n * len(self.grid)
-        x_sect, x_off = divmod(pos.x, len(self.grid[0]))
-        y_sect, y_off = divmod(pos.y, len(self.grid))
-        risk = self.grid[y_off][x_off]
-        risk = 1 + ((risk - 1 + x_sect + y_sect) % 9)
-        return risk
-    
-
-class MinPriorityQueue:
-    """A min priority queue with O(logn) insert, pop and change.
-    
-    Example:
 
-        >>> pq = MinPriorityQueue()
-        >>> len(pq)
-        0
-        >>> vals = list("abcdefgh")
-        >>> priorities = [10, 5, 9, 15, 8, 1, 2, 3]
-        >>> for v, p in zip(vals, priorities):
-        ...     pq.insert(v, p)
-        >>> len(pq)
-        8
-        >>> pq.find('c')
-        9
-        >>> pq.pop()
-        ('f', 1)
-        >>> len(pq)
-        7
-        >>> pq.find('c')
-        9
-        >>> pq.change('a', 100)
-        >>> len(pq)
-        7
-        >>> [pq.pop() for _ in range(4)]
-        [('g', 2), ('h', 3), ('b', 5), ('e', 8)]
-        >>> pq.find('a')
-        100
-        >>> [pq.pop() for _ in range(3)] 
-        [('c', 9), ('d', 15), ('a', 100)]
-    """
-    class _Entry:
-        __slots__ = ('priority', 'item')
-        def __init__(self, priority, item):
-            self.priority = priority
-            self.item = item               
-    
-    def __init__(self):
-        self._queue = [] 
-        self._pos = {}
-        
-    def __contains__(self, item) -> bool:
-        return item in self._pos
-        
-    def __len__(self) -> int:
-        return len(self._queue)
-        
-    def _perculate_up(self, index: int) -> int:
-        entry = self._queue[index]
-        while True:
-            if index == 0:
-                break   # at root
-            parent_idx = (index - 1) // 2
-            parent = self._queue[parent_idx]
-            if parent.priority <= entry.priority:
-                break
-            self._queue[parent_idx], self._queue[index] = entry, parent
-            self._pos[entry.item] = parent_idx
-            self._pos[parent.item] = index
-            index = parent_idx
-
-    @profile
-    def _perculate_down(self, index: int) -> int:
-        queue_len = len(self._queue)
-        while True:
-            l_idx, r_idx = 2*index + 1, 2*index + 2
-            if queue_len - 1 < l_idx:
-                # no children
-                break
-            min_child, min_idx = self._queue[l_idx], l_idx
-            if queue_len - 1 >= r_idx:
-                right = self._queue[r_idx]
-                if right.priority < min_child.priority:
-                    min_child, min_idx = right, r_idx
-            entry = self._queue[index]
-            if min_child.priority >= entry.priority:
-                break
-            self._queue[index], self._queue[min_idx] = min_child, entry
-            self._pos[min_child.item], self._pos[entry.item] = index, min_idx
-            index = min_idx
-        
-    def insert(self, item: Hashable, priority: int):
-        index = len(self._queue)
-        entry = self._Entry(priority, item)
-        self._queue.append(entry)
-        self._pos[item] = index
-        self._perculate_up(index)
-            
-    def pop(self):
-        entry = self._queue[0]
-        del self._pos[entry.item]
-
-        if len(self._queue) == 1:
-            self._queue.pop()
-        else:
-            self._queue[0] = self._queue.pop()
-            self._pos[self._queue[0].item] = 0
-            self._perculate_down(0)
-        return entry.item, entry.priority
-        
-    def change(self, item: Hashable, new_priority: int):
-        if item not in self._pos:
-            return self.insert(item, new_priority)
-        current = self._queue[self._pos[item]]
-        prev_priority = current.priority
-        current.priority = new_priority
-        if new_priority < prev_priority:
-            self._perculate_up(self._pos[item])
-        elif new_priority > prev_priority:
-            self._perculate_down(self._pos[item])
-            
-    def find(self, item: Hashable) -> int:
-        return self._queue[self._pos[item]].priority
-
-
-def parse_input(data: Iterable[str]) -> Grid:
+def parse_input(data: bytes) -> np.ndarray:
     r"""Returns the risk level map from data.
     
     Example:
 
-        >>> data = iter('''123
+        >>> data = b'''123
         ... 456
-        ... 789'''.split('\n'))
-        >>> grid = parse_input(data)
-        >>> [[grid[Position(x, y)] for x in range(3)] for y in range(3)]
-        [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+        ... 789
+        ... '''
+        >>> parse_input(data)
+        array([[1, 2, 3],
+               [4, 5, 6],
+               [7, 8, 9]], dtype=int8)
     """
-    return Grid([[int(l) for l in line.strip()] for line in data])
+    lines = data.split()
+    digits = np.frombuffer(b"".join(lines), dtype=np.uint8) - ord("0")
+    return digits.reshape(-1, len(lines[0])).astype(np.int8)
 
 
-def neighbours(p: Position, maxx: int, maxy: int) -> Iterable[Position]:
-    """Returns neighbouring positions of p.
-    
+def expand(grid: np.ndarray, n: int) -> np.ndarray:
+    """Returns the full map made up of n x n tiles of grid.
+
+    Risk levels in each tile are increased by the tile's distance from the
+    top left tile, wrapping back around to 1 after 9.
+
     Example:
 
-        >>> p = Position(0, 0)
-        >>> sorted(list(neighbours(p, 5, 5)))
-        [Position(x=0, y=1), Position(x=1, y=0)]
-        >>> p = Position(3, 3)
-        >>> sorted(list(neighbours(p, 5, 5)))
-        [Position(x=2, y=3), Position(x=3, y=2), Position(x=3, y=4), Position(x=4, y=3)]
-        >>> p = Position(5, 5)
-        >>> sorted(list(neighbours(p, 5, 5)))
-        [Position(x=4, y=5), Position(x=5, y=4)]
+        >>> expand(np.array([[8]], dtype=np.int8), 3)
+        array([[8, 9, 1],
+               [9, 1, 2],
+               [1, 2, 3]], dtype=int8)
+    """
+    height, width = grid.shape
+    ys, xs = np.indices((n, n))
+    # tiles[tile_y, tile_x, y, x]
+    tiles = 1 + (grid[None, None] - 1 + (xs + ys)[:, :, None, None]) % 9
+    return tiles.transpose(0, 2, 1, 3).reshape(n * height, n * width).astype(np.int8)
+
+
+@njit(cache=True)
+def _push(keys, vals, size, key, val):
+    """Pushes (key, val) onto the heap and returns the new heap size."""
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 2
+        if keys[parent] <= key:
+            break
+        keys[i], vals[i] = keys[parent], vals[parent]
+        i = parent
+    keys[i], vals[i] = key, val
+    return size + 1
+
+
+@njit(cache=True)
+def _pop(keys, vals, size):
+    """Pops the min (key, val) off the heap and returns (key, val, new size)."""
+    key, val = keys[0], vals[0]
+    size -= 1
+    last_key, last_val = keys[size], vals[size]
+    i = 0
+    while True:
+        first = 4*i + 1
+        if first >= size:
+            break   # no children
+        child = first
+        for sibling in range(first + 1, min(first + 4, size)):
+            if keys[sibling] < keys[child]:
+                child = sibling
+        if keys[child] >= last_key:
+            break
+        keys[i], vals[i] = keys[child], vals[child]
+        i = child
+    keys[i], vals[i] = last_key, last_val
+    return key, val, size
+
+
+@njit(cache=True)
+def _a_star(grid, width, start, end):
+    """Returns the lowest total risk from start to end, or -1.
+
+    grid is the flattened risk map and positions are flat indices,
+    y*width + x. Heap keys are the risk so far plus the Manhattan distance
+    to the end.
     """
-    for dx in [-1, 0, 1]:
-        for dy in [-1, 0, 1]:
-            if not (dx == 0 or dy == 0):
-                continue   # skip diagonals
-            if dx == 0 and dy == 0:
-                continue   # neighbours only
-            nx, ny = p.x + dx, p.y + dy
-            if nx < 0 or nx > maxx or ny < 0 or ny > maxy:
+    height = grid.size // width
+    dist = np.full(grid.size, _INF, dtype=np.int32)
+    # a position is only pushed when one of its 4 neighbours is popped
+    keys = np.empty(4 * grid.size + 1, dtype=np.int32)
+    vals = np.empty_like(keys)
+    sy, sx = divmod(start, width)
+    ey, ex = divmod(end, width)
+
+    dist[start] = 0
+    size = _push(keys, vals, 0, abs(ex - sx) + abs(ey - sy), start)
+    while size > 0:
+        estimate, pos, size = _pop(keys, vals, size)
+        y, x = divmod(pos, width)
+        risk = estimate - (abs(ex - x) + abs(ey - y))
+        if risk > dist[pos]:
+            continue   # stale, pos has since been pushed with a lower risk
+        if pos == end:
+            return risk
+        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            nx, ny = x + dx, y + dy
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
                 continue   # out of bounds
-            yield Position(nx, ny)
+            neighbour = pos + dy * width + dx
+            path_risk = risk + grid[neighbour]
+            if path_risk < dist[neighbour]:
+                dist[neighbour] = path_risk
+                estimate = path_risk + abs(ex - nx) + abs(ey - ny)
+                size = _push(keys, vals, size, estimate, neighbour)
+    return -1
 
 
-def lowest_risk(grid: Grid, start: Position, end: Position) -> int:
+def lowest_risk(grid: np.ndarray, start: Position, end: Position) -> int:
     r"""Returns the risk of the path of lowest risk.
 
     Example:
 
-        >>> grid = parse_input(iter(
-        ... '''123
+        >>> grid = parse_input(b'''123
         ... 119
-        ... 311'''.split('\n')))
-        >>> start = Position(0, 0)
-        >>> end = Position(2, 2)
-        >>> lowest_risk(grid, start, end)
+        ... 311''')
+        >>> lowest_risk(grid, (0, 0), (2, 2))
         4
     """
-    pq = MinPriorityQueue()
-    pq.change(start, 0)
-    visited = set()
-
-    while pq:
-        pos, risk = pq.pop()
-        visited.add(pos)
-        if pos == end:
-            return risk
-        for neighbour in neighbours(pos, grid.maxx, grid.maxy):
-            if neighbour in visited:
-                continue
-            path_risk = risk + grid[neighbour]
-            if neighbour not in pq or path_risk < pq.find(neighbour):
-                pq.change(neighbour, path_risk)
-
-    raise ValueError("failed to find path to end")
+    width = grid.shape[1]
+    risk = _a_star(
+        grid.ravel(),
+        width,
+        start[1] * width + start[0],
+        end[1] * width + end[0]
+    )
+    if risk < 0:
+        raise ValueError("failed to find path to end")
+    return int(risk)
     
 
 if __name__ == "__main__":
@@ -235,14 +162,13 @@ if __name__ == "__main__":
     parser.add_argument('path')
     args = parser.parse_args()
     
-    with open(args.path, 'r') as f:
-        grid = parse_input(f)
+    with open(args.path, 'rb') as f:
+        grid = parse_input(f.read())
         
-    start = Position(0, 0)
-    end = Position(grid.maxx, grid.maxy)
-
+    start = (0, 0)
+    end = (grid.shape[1] - 1, grid.shape[0] - 1)
     print(lowest_risk(grid, start, end))
 
-    grid.n = 5
-    end = Position(grid.maxx, grid.maxy)
-    print(lowest_risk(grid, start, end))
\ No newline at end of file
+    grid = expand(grid, 5)
+    end = (grid.shape[1] - 1, grid.shape[0] - 1)
+    print(lowest_risk(grid, start, end))
@@ -27,107 +27,220 @@ subpackets appear
 """
 import argparse
 import operator
-from dataclasses import dataclass
 from functools import reduce
 from typing import List
 
-import bitstring
-from bitstring import BitArray
-from bitstring import ConstBitStream
+import numpy as np
+from numba import njit
+
+
+LITERAL = 4
+
+
+@njit(cache=True)
+def read_uint(buf: np.ndarray, pos: int, k: int) -> int:
+    """Returns the k bit unsigned int at pos in the array of bits buf."""
+    value = 0
+    for i in range(pos, pos + k):
+        value = (value << 1) | buf[i]
+    return value
+
+
+@njit(cache=True)
+def _parse(buf):
+    """Returns the packets in the array of bits buf as flat arrays.
+
+    Packets are in pre-order. Returns (versions, type_ids, n_subs,
+    value_pos, n_groups) where n_subs is the number of sub-packets directly
+    contained by each Operator. A Literal's value can be wider than 64 bits
+    so isn't decoded here, instead value_pos is the position of its first
+    group and n_groups the number of groups.
+    """
+    # the shortest packet is an 11 bit Literal
+    cap = buf.size // 11 + 1
+    versions = np.zeros(cap, dtype=np.int64)
+    type_ids = np.zeros(cap, dtype=np.int64)
+    n_subs = np.zeros(cap, dtype=np.int64)
+    value_pos = np.zeros(cap, dtype=np.int64)
+    n_groups = np.zeros(cap, dtype=np.int64)
+    # Operators still reading sub-packets: index, position of the end of its
+    # sub-packets (length type 0) and number of sub-packets left (type 1),
+    # -1 when not applicable
+    open_idx = np.empty(cap, dtype=np.int64)
+    open_end = np.empty(cap, dtype=np.int64)
+    open_left = np.empty(cap, dtype=np.int64)
+    depth = 0
+    n = 0
+    pos = 0
+    while True:
+        if pos + 6 > buf.size:
+            raise ValueError("packet runs past end of bits")
+        if depth > 0:
+            n_subs[open_idx[depth - 1]] += 1
+            if open_left[depth - 1] > 0:
+                open_left[depth - 1] -= 1
+
+        versions[n] = read_uint(buf, pos, 3)
+        type_ids[n] = read_uint(buf, pos + 3, 3)
+        pos += 6
+        if type_ids[n] == LITERAL:
+            value_pos[n] = pos
+            more_groups = 1
+            while more_groups:
+                if pos + 5 > buf.size:
+                    raise ValueError("packet runs past end of bits")
+                more_groups = buf[pos]
+                n_groups[n] += 1
+                pos += 5
+        else:
+            if pos >= buf.size:
+                raise ValueError("packet runs past end of bits")
+            length_type_id = buf[pos]
+            pos += 1
+            n_length_bits = 15 if length_type_id == 0 else 11
+            if pos + n_length_bits > buf.size:
+                raise ValueError("packet runs past end of bits")
+            length = read_uint(buf, pos, n_length_bits)
+            pos += n_length_bits
+            if length_type_id == 0:
+                open_end[depth] = pos + length
+                open_left[depth] = -1
+            else:
+                open_end[depth] = -1
+                open_left[depth] = length
+            open_idx[depth] = n
+            depth += 1
+        n += 1
+
+        # close every Operator whose sub-packets have all been read
+        while depth > 0 and (
+            open_left[depth - 1] == 0
+            or 0 <= open_end[depth - 1] <= pos
+        ):
+            depth -= 1
+        if depth == 0:
+            break
+    return versions[:n], type_ids[:n], n_subs[:n], value_pos[:n], n_groups[:n]
+
+
+def literal_value(buf: np.ndarray, pos: int, n_groups: int) -> int:
+    """Returns the value of the n_groups 5 bit groups at pos in the array of bits buf.
+
+    Example:
+
+        >>> buf = np.array([1, 0, 1, 1, 1, 0, 0, 0, 0, 1], dtype=np.uint8)
+        >>> literal_value(buf, 0, 2)
+        113
+    """
+    nibbles = buf[pos:pos + 5 * n_groups].reshape(n_groups, 5)[:, 1:]
+    return int((nibbles + ord("0")).tobytes(), 2)
 
 
-@dataclass
 class Packet:
-    version: int
-    type_id: int
+    __slots__ = ("version", "type_id")
+
+    def __init__(self, version: int, type_id: int):
+        self.version = version
+        self.type_id = type_id
+
+    def __repr__(self) -> str:
+        return f"Packet(version={self.version}, type_id={self.type_id})"
 
 
-@dataclass
 class Literal(Packet):
-    type_id = 4
-    value: int
+    __slots__ = ("value",)
     
     def __init__(self, version: int, value: int):
-        self.version = version
+        super().__init__(version, LITERAL)
         self.value = value
 
-    @staticmethod
-    def from_bits(bits: ConstBitStream) -> "Literal":
-        """Returns a Literal parsed from bits.
-
-        Example:
-
-            >>> s = ConstBitStream('0b110100101111111000101000')
-            >>> Literal.from_bits(s)
-            Literal(version=6, type_id=4, value=2021)
-        """
-        version = bits.read("uint:3")
-        type_id = bits.read("uint:3")
-        if type_id != Literal.type_id:
-            raise ValueError(f"Literal type ID={Literal.type_id}, found {type_id}")
-        value = 0
-        more_groups = True
-        while more_groups:
-            more_groups = bits.read("bool")
-            value = (value << 4) + bits.read("uint:4")
-        return Literal(version, value)
-
-
-@dataclass
+    def __repr__(self) -> str:
+        return (
+            f"Literal(version={self.version}, type_id={self.type_id}, "
+            f"value={self.value})"
+        )
+
+
 class Operator(Packet):
-    
-    sub_packets: List[Packet]
+    __slots__ = ("sub_packets",)
     
     def __init__(self, version: int, type_id: int, sub_packets: List[Packet]):
-        self.version = version
-        self.type_id = type_id
+        super().__init__(version, type_id)
         self.sub_packets = sub_packets
 
-    @staticmethod
-    def from_bits(bits: ConstBitStream) -> "Operator":
-        """Returns an Operator parsed from bits.
+    def __repr__(self) -> str:
+        return (
+            f"Operator(version={self.version}, type_id={self.type_id}, "
+            f"sub_packets={self.sub_packets!r})"
+        )
 
-        Example:
-        
-            >>> s = ConstBitStream('0b00111000000000000110111101000101001010010001001000000000')
-            >>> print(Operator.from_bits(s))
-            Operator(version=1, type_id=6, sub_packets=[Literal(version=6, type_id=4, value=10), Literal(version=2, type_id=4, value=20)])
-        """
-        version = bits.read("uint:3")
-        type_id = bits.read("uint:3")
-        if type_id == Literal.type_id:
-            raise ValueError(f"Operator type ID!={Literal.type_id}")
-        length_type_id = bits.read("bool")
-        if length_type_id == 0:
-            n_subpackets = float("inf")
-            subpacket_bits = bits.read("uint:15")
-        else:
-            n_subpackets = bits.read("uint:11")
-            subpacket_bits = float("inf")
-        n_parsed = 0
-        start = bits.bitpos
-        subpackets = []
-        while n_parsed < n_subpackets and (bits.bitpos - start) < subpacket_bits:
-            _, next_type_id = bits.peeklist(["uint:3", "uint:3"])
-            if next_type_id == 4:
-                subpackets.append(Literal.from_bits(bits))
-            else:
-                subpackets.append(Operator.from_bits(bits))
-            n_parsed += 1
-        return Operator(version, type_id, subpackets)
 
+def from_hex(hex_str: str) -> Packet:
+    """Returns the outermost Packet encoded in hex_str.
 
-def from_bits(bits: ConstBitStream) -> Packet:
-    _, type_id = bits.peeklist(["uint:3", "uint:3"])
-    if type_id == 4:
-        return Literal.from_bits(bits)
-    return Operator.from_bits(bits)
+    Example:
+
+        >>> from_hex("D2FE28")
+        Literal(version=6, type_id=4, value=2021)
+        >>> from_hex("1310842108421084210840A0")
+        Literal(version=0, type_id=4, value=147573952589676412933)
+        >>> from_hex("D2FE")
+        Traceback (most recent call last):
+            ...
+        ValueError: packet runs past end of bits
+        >>> print(from_hex("38006F45291200"))
+        Operator(version=1, type_id=6, sub_packets=[Literal(version=6, type_id=4, value=10), Literal(version=2, type_id=4, value=20)])
+        >>> print(from_hex("EE00D40C823060"))
+        Operator(version=7, type_id=3, sub_packets=[Literal(version=2, type_id=4, value=1), Literal(version=4, type_id=4, value=2), Literal(version=1, type_id=4, value=3)])
+    """
+    # bytes.fromhex needs whole bytes, trailing zero bits are never read
+    hex_str += "0" * (len(hex_str) % 2)
+    buf = np.unpackbits(np.frombuffer(bytes.fromhex(hex_str), dtype=np.uint8))
+    versions, type_ids, n_subs, value_pos, n_groups = (
+        a.tolist() for a in _parse(buf)
+    )
+    # walk the pre-order packets backwards so each Operator's sub-packets
+    # are already built, first sub-packet on top
+    stack: List[Packet] = []
+    for i in reversed(range(len(versions))):
+        if type_ids[i] == LITERAL:
+            value = literal_value(buf, value_pos[i], n_groups[i])
+            stack.append(Literal(versions[i], value))
+        else:
+            sub_packets = [stack.pop() for _ in range(n_subs[i])]
+            stack.append(Operator(versions[i], type_ids[i], sub_packets))
+    return stack.pop()
 
 
 def version_sum(packet: Packet) -> int:
-    if isinstance(packet, Literal):
-        return packet.version
-    return packet.version + sum([version_sum(p) for p in packet.sub_packets])
+    """Returns the sum of the versions of packet and all its sub-packets.
+
+    Example:
+
+        >>> version_sum(from_hex("8A004A801A8002F478"))
+        16
+    """
+    total = 0
+    stack = [packet]
+    while stack:
+        packet = stack.pop()
+        total += packet.version
+        if packet.type_id != LITERAL:
+            stack.extend(packet.sub_packets)
+    return total
+
+
+# operator functions indexed by type_id, LITERAL has no operator
+OPS = (
+    sum,
+    lambda xs: reduce(operator.mul, xs, 1),
+    min,
+    max,
+    None,
+    lambda xs: int(xs[0] > xs[1]),
+    lambda xs: int(xs[0] < xs[1]),
+    lambda xs: int(xs[0] == xs[1]),
+)
 
 
 def calculate(packet: Packet) -> int:
@@ -135,7 +248,7 @@ def calculate(packet: Packet) -> int:
 
     Example:
 
-        >>> parse = lambda h: from_bits(ConstBitStream(hex=h))
+        >>> parse = from_hex
         >>> calculate(parse("C200B40A82"))
         3
         >>> calculate(parse("04005AC33890"))
@@ -153,16 +266,21 @@ def calculate(packet: Packet) -> int:
         >>> calculate(parse("9C0141080250320F1802104A08"))
         1
     """
-    if packet.type_id == 4: return packet.value
-    sps = [calculate(sp) for sp in packet.sub_packets]
-    if packet.type_id == 0: return sum(sps)
-    if packet.type_id == 1: return reduce(operator.mul, sps, 1)
-    if packet.type_id == 2: return min(sps)
-    if packet.type_id == 3: return max(sps)
-    if packet.type_id == 5: return int(sps[0] > sps[1])
-    if packet.type_id == 6: return int(sps[0] < sps[1])
-    if packet.type_id == 7: return int(sps[0] == sps[1])
-    raise NotImplementedError(f"unknown {packet.type_id=}")
+    # post-order traversal, operators are pushed back on once their
+    # sub-packets are queued and are applied once those are all evaluated
+    values = []
+    stack = [(packet, False)]
+    while stack:
+        packet, expanded = stack.pop()
+        if packet.type_id == LITERAL:
+            values.append(packet.value)
+        elif not expanded:
+            stack.append((packet, True))
+            stack.extend((sp, False) for sp in reversed(packet.sub_packets))
+        else:
+            n = len(values) - len(packet.sub_packets)
+            values[n:] = [OPS[packet.type_id](values[n:])]
+    return values[0]
     
 
 if __name__ == "__main__":
@@ -174,11 +292,11 @@ if __name__ == "__main__":
 
     if args.path is not None:
         with open(args.path, 'r') as f:
-            bits = ConstBitStream(hex=f.readline().strip())
+            hex_str = f.readline().strip()
     elif args.hex is not None:
-        bits = ConstBitStream(hex=args.hex)
+        hex_str = args.hex
         
-    packets = from_bits(bits)
+    packets = from_hex(hex_str)
     print(version_sum(packets))
 
     print(calculate(packets))
\ No newline at end of file
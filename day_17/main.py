@@ -27,14 +27,11 @@ def max_height(target: Target) -> int:
         >>> max_height(target)
         45
     """
-    if target.y_min <= 0 and target.y_max <= 0:
-        velocity = -target.y_min - 1
-    elif target.y_min >= 0 and target.y_max >= 0:
-        velocity = target.y_max
-    elif target.y_max >= -target.y_min:
-        velocity = target.y_max
+    # a probe launched upwards at v returns to y=0 moving at -(v+1)
+    if target.y_min <= 0:
+        velocity = max(target.y_max, -target.y_min - 1)
     else:
-        velocity = -target.y_min - 1
+        velocity = target.y_max
     return (velocity*(velocity+1)) // 2
 
 
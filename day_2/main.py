@@ -1,91 +1,74 @@
 import argparse
 import enum
 import re
-from pathlib import Path
-from typing import Iterable
 from typing import Tuple
 
+import numpy as np
 
-class CommandType(enum.Enum):
-    FORWARD = enum.auto()
-    DOWN = enum.auto()
-    UP = enum.auto()
 
+class CommandType(enum.IntEnum):
+    FORWARD = 0
+    DOWN = 1
+    UP = 2
 
-class Command:
-    _pattern = re.compile(r"(forward|down|up) (\d+)")
 
-    def __init__(self, direction: CommandType, distance: int):
-        self.direction = direction
-        self.distance = distance
+def parse_commands(data: str) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Returns the (directions, distances) of the commands in data.
 
-    @staticmethod
-    def fromstring(val: str):
-        """Returns a Command parsed from val.
+    Directions are CommandType values.
 
-            Example:
-                >>> Command.fromstring("forward 10")
-                Command('forward', 10)
-        """
-        match = Command._pattern.fullmatch(val)
-        if not match:
-            raise ValueError(f"failed, {val}")
-        return Command(
-            direction=CommandType[match[1].upper()],
-            distance=int(match[2])
-        )
-
-    def __repr__(self) -> str:
-        return f"Command('{self.direction.name.lower()}', {self.distance})"
-
-
-def navigate_part1(commands: Iterable[Command]) -> Tuple[int, int]:
+    Example:
+        >>> parse_commands("forward 10\nup 3\n")
+        (array([0, 2], dtype=int8), array([10,  3], dtype=int32))
+    """
+    matches = re.findall(r"^(forward|down|up) (\d+)$", data, re.MULTILINE)
+    n_lines = len([line for line in data.split("\n") if line])   # skip blanks
+    if len(matches) != n_lines:
+        raise ValueError("failed to parse all commands")
+    directions = np.array(
+        [CommandType[d.upper()] for d, _ in matches], dtype=np.int8
+    )
+    distances = np.array([int(n) for _, n in matches], dtype=np.int32)
+    return directions, distances
+
+
+def navigate_part1(directions: np.ndarray, distances: np.ndarray) -> Tuple[int, int]:
     """Returns a tuple of (horizontal position, depth) based on part 1 rules.
     
     Example:
-        >>> cmds = map(Command.fromstring, [
-        ...     "forward 5", "down 5", "forward 8", "up 3",
-        ...     "down 8", "forward 2"
-        ... ])
-        >>> navigate_part1(cmds)
+        >>> cmds = parse_commands(
+        ...     "forward 5\\ndown 5\\nforward 8\\nup 3\\ndown 8\\nforward 2"
+        ... )
+        >>> navigate_part1(*cmds)
         (15, 10)
     """
-    hor_pos, depth = 0, 0
-    for cmd in commands:
-        if cmd.direction == CommandType.FORWARD:
-            hor_pos += cmd.distance
-        elif cmd.direction == CommandType.DOWN:
-            depth += cmd.distance
-        elif cmd.direction == CommandType.UP:
-            depth -= cmd.distance
-        else:
-            raise ValueError(f"unknown command {cmd}")
-    return hor_pos, depth
+    hor_pos = distances[directions == CommandType.FORWARD].sum()
+    depth = (
+        distances[directions == CommandType.DOWN].sum()
+        - distances[directions == CommandType.UP].sum()
+    )
+    return int(hor_pos), int(depth)
 
 
-def navigate_part2(commands: Iterable[Command]) -> Tuple[int, int]:
+def navigate_part2(directions: np.ndarray, distances: np.ndarray) -> Tuple[int, int]:
     """Returns a tuple of (horizontal position, depth) based on part 2 rules.
     
     Example:
-        >>> cmds = map(Command.fromstring, [
-        ...     "forward 5", "down 5", "forward 8", "up 3",
-        ...     "down 8", "forward 2"
-        ... ])
-        >>> navigate_part2(cmds)
+        >>> cmds = parse_commands(
+        ...     "forward 5\\ndown 5\\nforward 8\\nup 3\\ndown 8\\nforward 2"
+        ... )
+        >>> navigate_part2(*cmds)
         (15, 60)
     """
-    hor_pos, depth, aim = 0, 0, 0
-    for cmd in commands:
-        if cmd.direction == CommandType.FORWARD:
-            hor_pos += cmd.distance
-            depth += aim * cmd.distance
-        elif cmd.direction == CommandType.DOWN:
-            aim += cmd.distance
-        elif cmd.direction == CommandType.UP:
-            aim -= cmd.distance
-        else:
-            raise ValueError(f"unknown command {cmd}")
-    return hor_pos, depth
+    aim_change = (
+        np.where(directions == CommandType.DOWN, distances, 0)
+        - np.where(directions == CommandType.UP, distances, 0)
+    )
+    aim = np.cumsum(aim_change, dtype=np.int64)
+    forward = directions == CommandType.FORWARD
+    hor_pos = distances[forward].sum()
+    depth = (distances[forward] * aim[forward]).sum()
+    return int(hor_pos), int(depth)
 
 
 if __name__ == "__main__":
@@ -93,14 +76,11 @@ if __name__ == "__main__":
     parser.add_argument("path")
     args = parser.parse_args()
 
-    commands = [
-        Command.fromstring(line.strip("\n"))
-        for line in open(args.path).readlines()
-        if line # skip whitespace
-    ]
+    with open(args.path, "r") as f:
+        directions, distances = parse_commands(f.read())
     
-    hor_pos, depth = navigate_part1(commands)
+    hor_pos, depth = navigate_part1(directions, distances)
     print(f"part 1: {hor_pos * depth}")
 
-    hor_pos, depth = navigate_part2(commands)
-    print(f"part 2: {hor_pos * depth}")
\ No newline at end of file
+    hor_pos, depth = navigate_part2(directions, distances)
+    print(f"part 2: {hor_pos * depth}")
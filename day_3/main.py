@@ -1,10 +1,16 @@
 import argparse
-from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Tuple
+from typing import Union
 
+import numpy as np
 
-TEST_REPORT = [
+
+# reports are (# entries, # bits) arrays of 0/1 values
+Report = np.ndarray
+
+TEST_REPORT = np.array([
     [0, 0, 1, 0, 0],
     [1, 1, 1, 1, 0],
     [1, 0, 1, 1, 0],
@@ -17,19 +23,22 @@ TEST_REPORT = [
     [1, 1, 0, 0, 1],
     [0, 0, 0, 1, 0],
     [0, 1, 0, 1, 0]
-]
+], dtype=np.uint8)
 
 
-def parse_report(report: Iterable[str]) -> Iterable[List[int]]:
-    """
+def parse_report(report: bytes) -> Report:
+    r"""
     Example:
 
-        >>> report = ["00100", "11110", "10110"]
-        >>> list(parse_report(report))
-        [[0, 0, 1, 0, 0], [1, 1, 1, 1, 0], [1, 0, 1, 1, 0]]
+        >>> report = b"00100\n11110\n10110\n"
+        >>> parse_report(report)
+        array([[0, 0, 1, 0, 0],
+               [1, 1, 1, 1, 0],
+               [1, 0, 1, 1, 0]], dtype=uint8)
     """
-    for line in report:
-        yield [int(b) for b in line.rstrip()]
+    lines = report.split()
+    bits = np.frombuffer(b"".join(lines), dtype=np.uint8) - ord("0")
+    return bits.reshape(len(lines), -1)
 
 
 def to_int(binary: List[int]) -> int:
@@ -43,37 +52,28 @@ def to_int(binary: List[int]) -> int:
     """
     n = 0
     for b in binary:
-        n = (n * 2) + b
+        n = (n * 2) + int(b)
     return n
 
 
-def bit_cnt(report: Iterable[List[int]], pos: int = None) -> Tuple[int, List[int]]:
+def bit_cnt(report: Report, pos: Optional[int] = None) -> Tuple[int, Union[int, np.ndarray]]:
     """Returns # report entries and # of bits set to 1 in each position.
 
     Example:
 
         >>> bit_cnt(TEST_REPORT)
-        (12, [7, 5, 8, 7, 5])
+        (12, array([7, 5, 8, 7, 5]))
         >>> bit_cnt(TEST_REPORT, 1)
         (12, 5)
         >>> [bit_cnt(TEST_REPORT, i)[1] for i in range(5)]
         [7, 5, 8, 7, 5]
     """
-    counts = None
-    n = 0
-    for parameter in report:
-        n += 1
-        if counts is None:
-            counts = parameter if pos is None else parameter[pos]
-        else:
-            if pos is None:
-                counts = [c + p for c, p in zip(counts, parameter)]
-            else:
-                counts += parameter[pos]
-    return n, counts
-
-
-def power_consumption(report: Iterable[List[int]]) -> int:
+    if pos is None:
+        return len(report), report.sum(axis=0, dtype=np.int64)
+    return len(report), int(report[:, pos].sum())
+
+
+def power_consumption(report: Report) -> int:
     """Returns the power consumption given the report.
 
     Example:
@@ -82,12 +82,12 @@ def power_consumption(report: Iterable[List[int]]) -> int:
         198
     """
     n, counts = bit_cnt(report)
-    gamma_rate = to_int([c >= n // 2 for c in counts])
-    epsilon_rate = to_int([c <= n // 2 for c in counts])
+    gamma_rate = to_int(counts >= n // 2)
+    epsilon_rate = to_int(counts <= n // 2)
     return gamma_rate * epsilon_rate
 
 
-def rating(report: List[List[int]], mcv: bool = True) -> int:
+def rating(report: Report, mcv: bool = True) -> int:
     """Returns the rating using Part 2 rules.
 
     Example:
@@ -102,12 +102,12 @@ def rating(report: List[List[int]], mcv: bool = True) -> int:
         n, cnt = bit_cnt(report, i)
         target = cnt >= (n / 2)
         target = int(target if mcv else not target)
-        report = [p for p in report if p[i] == target]
+        report = report[report[:, i] == target]
         i += 1
     return to_int(report[0])
 
 
-def life_support_rating(report: List[List[int]]) -> int:
+def life_support_rating(report: Report) -> int:
     """Returns the life support rating of the submarine.
 
     Example:
@@ -125,8 +125,8 @@ if __name__ == "__main__":
     parser.add_argument("path")
     args = parser.parse_args()
 
-    with open(args.path, "r") as f:
-        report = list(parse_report(f))
+    with open(args.path, "rb") as f:
+        report = parse_report(f.read())
 
     pc = power_consumption(report)
     print(f"power consumption: {pc}")
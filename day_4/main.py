@@ -22,96 +22,37 @@ import numpy as np
 
 
 class Board:
+    # each board entry maps to bit at pos 2**i, where i is:
+    #
+    #  0  1  2  3  4
+    #  5  6  7  8  9
+    # 10 11 12 13 14
+    # 15 16 17 18 19
+    # 20 21 22 23 24
+    #
+    # marks for every board are kept together in play(), these are the
+    # bitmasks for each complete row then each complete column
+    _WIN_MASKS = tuple(
+        [0b11111 << (5*row) for row in range(5)] +
+        [0b00001_00001_00001_00001_00001 << col for col in range(5)]
+    )
+
     def __init__(self, board: List[List[int]]):
-        # each board entry maps to bit at pos 2**i, where i is:
-        #
-        #  0  1  2  3  4
-        #  5  6  7  8  9
-        # 10 11 12 13 14
-        # 15 16 17 18 19
-        # 20 21 22 23 24
-        self._marked = np.int32(0)
         self.board = board
 
-    def mark(self, row: int, col: int) -> None:
-        """
-        Example:
-
-            >>> b = Board(range(5*i, 5*(i+1)) for i in range(5))
-            >>> b.is_marked(row=3, col=2)
-            False
-            >>> b.mark(row=3, col=2)
-            >>> b.is_marked(row=3, col=2)
-            True
-        """
-        self._marked |= 2**(5*row + col)
-
-    def is_marked(self, row: int, col: int) -> bool:
-        return bool(self._marked & 2**(5*row + col))
-
-    def win(self) -> bool:
-        """Returns True if the board has won.
-
-        Example:
-
-            >>> b = Board(list(range(5*i, 5*(i+1)) for i in range(5)))
-            >>> b.win()
-            False
-            >>> for i in range(5):
-            ...     b.mark(row=0, col=i)
-            >>> b.win()
-            True
-        """
-        row = 0b11111
-        col = 0b00_00000_00001_00001_00001_00001_00001
-        return np.any([
-            (self._marked & row) == row,
-            (self._marked & (row << 5)) == (row << 5),
-            (self._marked & (row << 10)) == (row << 10),
-            (self._marked & (row << 15)) == (row << 15),
-            (self._marked & (row << 20)) == (row << 20),
-            (self._marked & col) == col,
-            (self._marked & (col << 1)) == (col << 1),
-            (self._marked & (col << 2)) == (col << 2),
-            (self._marked & (col << 3)) == (col << 3),
-            (self._marked & (col << 4)) == (col << 4)
-        ])
-
     def __repr__(self) -> str:
         """
         
         Example:
 
-            >>> b = Board([list(range(5*i, 5*(i + 1))) for i in range(5)])
-            >>> b.mark(row=4, col=1)
-            >>> b
+            >>> Board([list(range(5*i, 5*(i + 1))) for i in range(5)])
             [0, 1, 2, 3, 4]
             [5, 6, 7, 8, 9]
             [10, 11, 12, 13, 14]
             [15, 16, 17, 18, 19]
             [20, 21, 22, 23, 24]
-            <BLANKLINE>
-            [0, 0, 0, 0, 0]
-            [0, 0, 0, 0, 0]
-            [0, 0, 0, 0, 0]
-            [0, 0, 0, 0, 0]
-            [0, 1, 0, 0, 0]
         """
-        s = []
-
-        for row in self.board:
-            s.append(str(row))
-        s.append('')
-        for row_idx in range(5):
-            s_row = ['[']
-            for col_idx in range(5):
-                s_row.append(str(int((self.is_marked(row_idx, col_idx)))))
-                if col_idx < 4:
-                    s_row.append(', ')
-            s_row.append("]")
-            s.append(''.join(s_row))
-
-        return "\n".join(s)
+        return "\n".join(str(row) for row in self.board)
 
 
 def parse_input(data: Iterable[str]) -> Tuple[List[int], List[Board]]:
@@ -130,23 +71,54 @@ def parse_input(data: Iterable[str]) -> Tuple[List[int], List[Board]]:
     return draws, boards
 
 
-def gen_boards_with(boards: List[Board]) -> Mapping[int, Tuple[Board, Tuple[int, int]]]:
-    """Returns a list of (board, (row, col)) containing a number."""
-    boards_with = defaultdict(list)
-    for board in boards:
+def gen_boards_with(boards: List[Board]) -> Mapping[int, Tuple[np.ndarray, np.ndarray]]:
+    """Returns number -> (board indices, position bits) of the cells containing it."""
+    boards_with = defaultdict(lambda: ([], []))
+    for board_idx, board in enumerate(boards):
         for row_idx, row in enumerate(board.board):
             for col_idx, val in enumerate(row):
-                boards_with[val].append((board, (row_idx, col_idx)))
-    return boards_with
-
+                idxs, bits = boards_with[val]
+                idxs.append(board_idx)
+                bits.append(1 << (5*row_idx + col_idx))
+    return {
+        val: (np.array(idxs, dtype=np.intp), np.array(bits, dtype=np.uint32))
+        for val, (idxs, bits) in boards_with.items()
+    }
+
+
+def play(draws: List[int], boards: List[Board]) -> Iterable[Tuple[int, int, int]]:
+    """Returns (board index, winning draw, unmarked sum) for boards as they win.
+
+    All boards are marked at once: each board's marks are an element of a
+    single uint32 bit-board vector and every draw checks all of the win
+    masks against every board in one operation.
+
+    Example:
+
+        >>> boards = [
+        ...     Board([list(range(25*b + 5*i, 25*b + 5*(i + 1))) for i in range(5)])
+        ...     for b in range(2)
+        ... ]
+        >>> list(play([25, 26, 27, 28, 0, 1, 2, 3, 4, 29], boards))
+        [(0, 4, 290), (1, 29, 790)]
+    """
+    numbers = np.array([board.board for board in boards]).reshape(len(boards), 25)
+    cell_bits = np.uint32(1) << np.arange(25, dtype=np.uint32)
+    win_masks = np.array(Board._WIN_MASKS, dtype=np.uint32)
+    marks = np.zeros(len(boards), dtype=np.uint32)
+    won = np.zeros(len(boards), dtype=bool)
 
-def score(board: Board) -> int:
-    return sum([
-        n 
-        for row_idx, row in enumerate(board.board)
-        for col_idx, n in enumerate(row)
-        if not board.is_marked(row_idx, col_idx)
-    ])
+    boards_with = gen_boards_with(boards)
+    for n in draws:
+        if n not in boards_with:
+            continue
+        idxs, bits = boards_with.pop(n)   # duplicate draws are a noop
+        np.bitwise_or.at(marks, idxs, bits)
+        wins = ((marks[:, None] & win_masks) == win_masks).any(axis=1)
+        for board_idx in np.flatnonzero(wins & ~won):
+            unmarked = (marks[board_idx] & cell_bits) == 0
+            yield int(board_idx), n, int(numbers[board_idx][unmarked].sum())
+        won |= wins
 
 
 if __name__ == "__main__":
@@ -156,18 +128,11 @@ if __name__ == "__main__":
 
     with open(args.path, 'r') as f:
         draws, boards = parse_input(f)
-        
-    boards_with = gen_boards_with(boards)
-    has_won = set()
-    for n in draws:
-        for board, (row, col) in boards_with[n]:
-            board.mark(row, col)
-            if board.win():
-                if len(has_won) == 0:
-                    print(f"part 1: {score(board) * n}")
-                has_won.add(board)
-                if len(has_won) == len(boards):
-                    print(f"part 2: {score(board) * n}")
-                    exit()
-        del boards_with[n]   # duplicate draws are a noop
 
+    wins = list(play(draws, boards))
+    if wins:
+        _, n, unmarked = wins[0]
+        print(f"part 1: {unmarked * n}")
+    if len(wins) == len(boards):
+        _, n, unmarked = wins[-1]
+        print(f"part 2: {unmarked * n}")
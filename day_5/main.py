@@ -1,83 +1,78 @@
 import argparse
-import itertools
 import re
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Iterable
-from typing import NamedTuple
+from typing import Tuple
 
+import numpy as np
 
-class Position(NamedTuple):
-    x: int
-    y: int
 
+# line segments are (N, 4) arrays of (x1, y1, x2, y2) rows
+Segments = np.ndarray
 
-@dataclass
-class Line:
-    start: Position
-    end: Position
 
-    def __iter__(self) -> Iterable[Position]:
-        """Returns an Iterable over all Positions on the line.
+def parse_lines(data: bytes) -> Segments:
+    r"""Returns line segments parsed from data.
 
-        Example:
+    Example:
+        >>> data = b'''0,9 -> 5,9
+        ... 8,0 -> 0,8
+        ... 9,4 -> 3,4'''
+        >>> parse_lines(data)
+        array([[0, 9, 5, 9],
+               [8, 0, 0, 8],
+               [9, 4, 3, 4]], dtype=int32)
+    """
+    matches = re.findall(rb"^(\d+),(\d+) -> (\d+),(\d+)\r?$", data, re.MULTILINE)
+    n_lines = len([line for line in data.split(b"\n") if line.strip()])
+    if len(matches) != n_lines:
+        raise ValueError("failed to parse all lines")
+    return np.array(matches, dtype=np.int32).reshape(-1, 4)
 
-            >>> line = Line(
-            ...     start=Position(0, 2), end=Position(0, 4)
-            ... )
-            >>> list(iter(line))
-            [Position(x=0, y=2), Position(x=0, y=3), Position(x=0, y=4)]
-            >>> line = Line(Position(1, 1), Position(1, 1))
-            >>> list(iter(line))
-            [Position(x=1, y=1)]
 
-        """
-        if self.start == self.end:
-            yield self.start
-            return
+def coords(segments: Segments) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the (xs, ys) of all positions on all line segments.
 
-        if self.start.x == self.end.x:
-            x_iter = itertools.repeat(self.start.x)
-        else:
-            x_dir = 1 if self.start.x <= self.end.x else -1
-            x_iter = range(self.start.x, self.end.x + x_dir, x_dir)
+    Example:
 
-        if self.start.y == self.end.y:
-            y_iter = itertools.repeat(self.start.y)
-        else:
-            y_dir = 1 if self.start.y <= self.end.y else -1
-            y_iter = range(self.start.y, self.end.y + y_dir, y_dir)
-        
-        for (x, y) in zip(x_iter, y_iter):
-            yield Position(x, y)
+        >>> coords(np.array([[3, 1, 1, 3], [0, 2, 2, 2]]))
+        (array([3, 2, 1, 0, 1, 2]), array([1, 2, 3, 2, 2, 2]))
+    """
+    x1, y1, x2, y2 = segments.T
+    dx, dy = x2 - x1, y2 - y1
+    lengths = np.maximum(np.abs(dx), np.abs(dy)) + 1
+    # index of each position's segment and how far along that segment it is
+    segment = np.repeat(np.arange(len(segments)), lengths)
+    steps = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    xs = x1[segment] + np.sign(dx)[segment] * steps
+    ys = y1[segment] + np.sign(dy)[segment] * steps
+    return xs, ys
 
 
-def parse_lines(data: Iterable[str]) -> Iterable[Line]:
-    r"""Returnes Lines parsed from data.
+def count_overlaps(segments: Segments) -> int:
+    r"""Returns the # of positions covered by at least two line segments.
 
     Example:
-        >>> data = '''0,9 -> 5,9
+
+        >>> data = b'''0,9 -> 5,9
         ... 8,0 -> 0,8
-        ... 9,4 -> 3,4'''
-        >>> data = data.split('\n')
-        >>> expected = [
-        ...     Line(Position(0, 9), Position(5, 9)),
-        ...     Line(Position(8, 0), Position(0, 8)),
-        ...     Line(Position(9, 4), Position(3, 4))
-        ... ]
-        >>> list(parse_lines(data)) == expected
-        True
+        ... 9,4 -> 3,4
+        ... 2,2 -> 2,1
+        ... 7,0 -> 7,4
+        ... 6,4 -> 2,0
+        ... 0,9 -> 2,9
+        ... 3,4 -> 1,4
+        ... 0,0 -> 8,8
+        ... 5,5 -> 8,2'''
+        >>> count_overlaps(parse_lines(data))
+        12
     """
-    pattern = re.compile(r"(\d+),(\d+) -> (\d+),(\d+)\n?")
-    lines = []
-    for line in data:
-        match = pattern.fullmatch(line)
-        if not match:
-            raise ValueError(f"failed to parse {repr(line)}")
-        yield Line(
-            start=Position(int(match[1]), int(match[2])), 
-            end=Position(int(match[3]), int(match[4]))
-        )
+    if len(segments) == 0:
+        return 0
+    width = segments[:, [0, 2]].max() + 1
+    height = segments[:, [1, 3]].max() + 1
+    counts = np.zeros((height, width), dtype=np.uint16)
+    xs, ys = coords(segments)
+    np.add.at(counts, (ys, xs), 1)
+    return int(np.count_nonzero(counts >= 2))
 
 
 if __name__ == "__main__":
@@ -85,26 +80,12 @@ if __name__ == "__main__":
     parser.add_argument("path")
     args = parser.parse_args()
 
-    with open(args.path, 'r') as f:
-        lines = parse_lines(f)
-        is_hor_vert = lambda l: l.start.x == l.end.x or l.start.y == l.end.y
-        counts = defaultdict(int)
-        hor_vert_counts = defaultdict(int)
-        for line in lines:
-            hor_vert = is_hor_vert(line)
-            for pos in line:
-                counts[pos] += 1
-                if hor_vert:
-                    hor_vert_counts[pos] += 1
-
-        n_hor_vert_overlap = len([
-            p for p, cnt in hor_vert_counts.items()
-            if cnt >= 2
-        ])
-        print(f"overlapping horzontal or vertical line positions: {n_hor_vert_overlap}")
-
-        n_overlap = len([
-            p for p, cnt in counts.items()
-            if cnt >= 2
-        ])
-        print(f"overlapping positions: {n_overlap}")
\ No newline at end of file
+    with open(args.path, 'rb') as f:
+        segments = parse_lines(f.read())
+
+    x1, y1, x2, y2 = segments.T
+    n_hor_vert_overlap = count_overlaps(segments[(x1 == x2) | (y1 == y2)])
+    print(f"overlapping horzontal or vertical line positions: {n_hor_vert_overlap}")
+
+    n_overlap = count_overlaps(segments)
+    print(f"overlapping positions: {n_overlap}")
@@ -1,30 +1,71 @@
 import argparse
-from collections import defaultdict
-from typing import Dict
 
-State = Dict[int, int]
+import numpy as np
 
+State = np.ndarray   # State[days_left] = number of laternfish
+N_TIMERS = 9
 
-def step(state: State) -> State:
-    """Returns the new State after updating all laternfish timers.
+
+def parse_state(line: str) -> State:
+    """Returns the State for the comma separated timers in line.
 
     Example:
 
-        >>> state = {3: 2, 4: 1, 1: 1, 2: 1}
-        >>> state = step(state)
+        >>> parse_state("3,4,3,1,2")
+        array([0, 1, 1, 2, 1, 0, 0, 0, 0])
+    """
+    timers = np.array(line.split(","), dtype=np.int64)
+    return np.bincount(timers, minlength=N_TIMERS).astype(np.int64)
+
+
+def step(state: State) -> None:
+    """Updates all laternfish timers in state, in place.
+
+    Example:
+
+        >>> state = parse_state("3,4,3,1,2")
+        >>> step(state)
         >>> state
-        {2: 2, 3: 1, 0: 1, 1: 1}
+        array([1, 1, 2, 1, 0, 0, 0, 0, 0])
         >>> step(state)
-        {1: 2, 2: 1, 6: 1, 8: 1, 0: 1}
+        >>> state
+        array([1, 2, 1, 0, 0, 0, 1, 0, 1])
     """
-    new_state = defaultdict(int)
-    for days_left, cnt in state.items():
-        if days_left == 0:
-            new_state[6] += cnt
-            new_state[8] += cnt
-        else:
-            new_state[days_left - 1] += cnt
-    return dict(new_state)
+    spawning = state[0]
+    state[:-1] = state[1:]
+    state[6] += spawning
+    state[8] = spawning
+
+
+def _transition() -> np.ndarray:
+    """Returns the matrix M such that M @ state is step applied to state."""
+    m = np.zeros((N_TIMERS, N_TIMERS), dtype=object)
+    for days_left in range(1, N_TIMERS):
+        m[days_left - 1, days_left] = 1
+    m[6, 0] = 1
+    m[8, 0] = 1
+    return m
+
+
+# object dtype so entries are Python ints and never overflow
+TRANSITION = _transition()
+
+
+def count_after(state: State, days: int) -> int:
+    """Returns the number of laternfish after days have passed.
+
+    Applies step days times in O(log days) matrix multiplications.
+
+    Example:
+
+        >>> state = parse_state("3,4,3,1,2")
+        >>> count_after(state, 18)
+        26
+        >>> count_after(state, 256)
+        26984457539
+    """
+    final = np.linalg.matrix_power(TRANSITION, days) @ state.astype(object)
+    return int(final.sum())
 
 
 if __name__ == "__main__":
@@ -34,12 +75,6 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     with open(args.path, "r") as f:
-        day_strs = f.readline().rstrip().split(",")
-    state = defaultdict(int)
-    for day in day_strs:
-        state[int(day)] += 1
-
-    for _ in range(args.days):
-        state = step(state)
-        
-    print(sum(state.values()))
\ No newline at end of file
+        state = parse_state(f.readline().rstrip())
+
+    print(count_after(state, args.days))
@@ -1,7 +1,7 @@
 """
 Part 1: The first thing that comes to mind is taking the median. If 50% of the values are lower than or equal to this, and 50% are greater than or equal to this then shifting this position one to the left or right will cause the total distance moved to be >= 0.
 
-Part 2: The mean will take into account outliers. 
+Part 2: The mean will take into account outliers, but the optimum is only guaranteed to be within 1/2 of it. Rather than rely on that every position between the min and max is tried at once with a broadcast.
 """
 import argparse
 from typing import List
@@ -11,31 +11,40 @@ from typing import Tuple
 import numpy as np
 
 
-def parse_input(data: str) -> List[int]:
+def parse_input(data: str) -> np.ndarray:
     """Returns the input parsed from data.
 
     Example:
 
         >>> data = '16,1,2,0,4,2,7,1,2,14'
         >>> parse_input(data)
-        [16, 1, 2, 0, 4, 2, 7, 1, 2, 14]
+        array([16,  1,  2,  0,  4,  2,  7,  1,  2, 14])
     """
-    return [int(i) for i in data.rstrip().split(',')]
+    return np.array(data.rstrip().split(','), dtype=np.int64)
 
 
 def part_1_position_fuel(positions: List[int]) -> Tuple[int, int]:
     """Returns the (aligned position, total fuel).
 
+    With an even number of positions every target between the two middle
+    values uses the same fuel, the rounded median (their midpoint) is used.
+
     Example:
         
         >>> positions = [16, 1, 2, 0, 4, 2, 7, 1, 2, 14]
         >>> part_1_position_fuel(positions)
         (2, 37)
+        >>> part_1_position_fuel([0, 0, 10, 10])
+        (5, 20)
     """
-    positions = np.array(positions)
-    target = round(np.median(positions))
-    fuel = np.sum(np.abs(positions - target))
-    return target, fuel
+    positions = np.asarray(positions, dtype=np.int64)
+    # select the middle value(s) in O(N) rather than sorting for np.median
+    lower, upper = (len(positions) - 1) // 2, len(positions) // 2
+    middle = np.partition(positions, [lower, upper])
+    target = round((int(middle[lower]) + int(middle[upper])) / 2)
+    distances = np.subtract(positions, target)
+    np.abs(distances, out=distances)
+    return target, int(distances.sum())
 
 
 def part_2_position_fuel(positions: List[int]) -> Tuple[int, int]:
@@ -47,16 +56,23 @@ def part_2_position_fuel(positions: List[int]) -> Tuple[int, int]:
         >>> part_2_position_fuel(positions)
         (5, 168)
     """
-    positions = np.array(positions)
-    target = np.mean(positions)
-    min_dist, min_fuel = None, None
-    for int_tgt in [int(np.floor(target)), int(np.ceil(target))]:
-        distances = np.abs(positions - int_tgt)
-        fuel = np.sum((distances * (distances + 1)) // 2)
-        if min_fuel is None or fuel < min_fuel:
-            min_dist = int_tgt
-            min_fuel = fuel
-    return min_dist, min_fuel
+    positions = np.asarray(positions, dtype=np.int64)
+    targets = np.arange(positions.min(), positions.max() + 1)
+    distances = np.abs(positions[:, None] - targets[None, :])
+    fuels = ((distances * (distances + 1)) // 2).sum(axis=0)
+    i = fuels.argmin()
+    return int(targets[i]), int(fuels[i])
+
+
+def position_fuels(positions: np.ndarray) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Returns the part 1 and part 2 (aligned position, total fuel).
+
+    Example:
+
+        >>> position_fuels(parse_input('16,1,2,0,4,2,7,1,2,14'))
+        ((2, 37), (5, 168))
+    """
+    return part_1_position_fuel(positions), part_2_position_fuel(positions)
 
 
 if __name__ == "__main__":
@@ -67,8 +83,9 @@ if __name__ == "__main__":
     with open(args.path, 'r') as f:
         positions = parse_input(f.readline())
 
-    target, fuel = part_1_position_fuel(positions)
+    part_1, part_2 = position_fuels(positions)
+    target, fuel = part_1
     print(f"part 1, total fuel to align to position {target}: {fuel}")
    
-    target, fuel = part_2_position_fuel(positions)
+    target, fuel = part_2
     print(f"part 2, total fuel to align to position {target}: {fuel}")
\ No newline at end of file
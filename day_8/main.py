@@ -13,12 +13,16 @@ Input: Set of 10 signal patterns and a set of 4 segments.
 """
 import argparse
 import itertools
-import re
 from collections import defaultdict
 from collections import namedtuple
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+from numba import prange
 
 
 Pattern = str
@@ -38,31 +42,152 @@ def parse_input(data: Iterable[str]) -> List[Entry]:
         Entry(signal=('be', 'cfbegad', 'cbdgef', 'fgaecd', 'cgeb', 'fdcge', 'agebfd', 'fecdb', 'fabcd', 'edb'), output=('fdgacbe', 'cefdb', 'cefbgd', 'gcbe'))
         Entry(signal=('edbfga', 'begcd', 'cbg', 'gc', 'gcadebf', 'fbgde', 'acbgfd', 'abcde', 'gfcbed', 'gfec'), output=('fcgedb', 'cgb', 'dgebacf', 'gc'))
     """
-    pattern = re.compile(
-        ("([a-g]+) " * 10) +
-        "\| " +
-        ("([a-g]+) ?" * 4)
-    )
     entries = []
     for line in data:
         line = line.rstrip()
-        p = pattern.fullmatch(line)
-        if p is None:
+        signal, sep, output = line.partition(" | ")
+        signal, output = tuple(signal.split(" ")), tuple(output.split(" "))
+        if not sep or len(signal) != 10 or len(output) != 4:
             raise ValueError(f"failed to match {line}")
-        groups = p.groups()
-        entries.append(Entry(groups[:10], groups[10:]))
+        entries.append(Entry(signal, output))
 
     return entries
 
 
 def count_unique(entries: List[Entry]) -> int:
     """Returns the number of output entries that are a 1, 4, 7 or 8."""
-    n = 0
-    for entry in entries:
-        for v in entry.output:
-            if len(v) in [2, 4, 3, 7]:
-                n += 1
-    return n
+    lens = np.fromiter(
+        (len(v) for entry in entries for v in entry.output),
+        dtype=np.int8,
+        count=4 * len(entries),
+    )
+    return int(((lens == 2) | (lens == 3) | (lens == 4) | (lens == 7)).sum())
+
+
+# CHAR2BIT[ord(c)] is the bit for signal c
+CHAR2BIT = np.zeros(256, dtype=np.uint8)
+CHAR2BIT[ord("a"):ord("a") + 7] = 1 << np.arange(7)
+
+
+def to_masks(patterns: List[Pattern]) -> np.ndarray:
+    """Returns patterns as 7-bit ints with bit i set if signal chr(ord('a') + i) is on.
+
+    Example:
+
+        >>> [bin(m) for m in to_masks(["gab", "c"])]
+        ['0b1000011', '0b100']
+    """
+    chars = np.frombuffer("".join(patterns).encode(), dtype=np.uint8)
+    lens = np.fromiter(map(len, patterns), dtype=np.intp, count=len(patterns))
+    return np.bitwise_or.reduceat(CHAR2BIT[chars], np.cumsum(lens) - lens)
+
+
+def encode(entries: List[Entry]) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the (signal, output) masks of entries as uint8 arrays.
+
+    Example:
+
+        >>> signals, outputs = encode([Entry(signal=("ab",) * 10, output=("b", "g", "ab", "abg"))])
+        >>> signals.shape
+        (1, 10)
+        >>> outputs
+        array([[ 2, 64,  3, 67]], dtype=uint8)
+    """
+    masks = to_masks(
+        [p for entry in entries for p in itertools.chain(entry.signal, entry.output)]
+    ).reshape(-1, 14)
+    return masks[:, :10].copy(), masks[:, 10:].copy()
+
+
+@njit(cache=True, inline="always")
+def popcount(x: int) -> int:
+    """Returns the number of set bits in the 7-bit int x."""
+    x = x - ((x >> 1) & 0x55)
+    x = (x & 0x33) + ((x >> 2) & 0x33)
+    return (x + (x >> 4)) & 0x0F
+
+
+def _digit(n_segments: int, n_common_4: int, n_common_1: int) -> int:
+    """Returns the digit of a value from its number of segments and the
+    number in common with the 4 and the 1, or -1 if there isn't one.
+    """
+    if n_segments == 2:
+        return 1
+    elif n_segments == 3:
+        return 7
+    elif n_segments == 4:
+        return 4
+    elif n_segments == 7:
+        return 8
+    elif n_segments == 5:
+        if n_common_4 == 2:
+            return 2
+        elif n_common_4 == 3 and n_common_1 == 1:
+            return 5
+        elif n_common_4 == 3 and n_common_1 == 2:
+            return 3
+    elif n_segments == 6:
+        if n_common_4 == 4:
+            return 9
+        elif n_common_4 == 3 and n_common_1 == 1:
+            return 6
+        elif n_common_4 == 3 and n_common_1 == 2:
+            return 0
+    return -1
+
+
+# DIGIT_LUT[(n_segments << 6) | (n_common_4 << 3) | n_common_1] is the digit,
+# each count is at most 7 so fits in 3 bits
+DIGIT_LUT = np.array(
+    [_digit(k >> 6, (k >> 3) & 0b111, k & 0b111) for k in range(512)],
+    dtype=np.int8,
+)
+
+
+@njit(cache=True)
+def decode_masks(signal: np.ndarray, output: np.ndarray) -> int:
+    """Returns the decoded output int for one entry's signal and output masks.
+
+    Returns -1 if a value cannot be decoded.
+    """
+    mask_1 = 0
+    mask_4 = 0
+    for s in signal:
+        n = popcount(s)
+        if n == 2:
+            mask_1 = s
+        elif n == 4:
+            mask_4 = s
+
+    num = 0
+    for value in output:
+        digit = DIGIT_LUT[
+            (popcount(value) << 6)
+            | (popcount(mask_4 & value) << 3)
+            | popcount(mask_1 & value)
+        ]
+        if digit < 0:
+            return -1
+        num = num * 10 + digit
+    return num
+
+
+@njit(cache=True, parallel=True)
+def _decode_all(signals: np.ndarray, outputs: np.ndarray) -> np.ndarray:
+    """Returns decode_masks for every entry, decoded in parallel."""
+    nums = np.empty(signals.shape[0], dtype=np.int64)
+    for i in prange(signals.shape[0]):
+        nums[i] = decode_masks(signals[i], outputs[i])
+    return nums
+
+
+def output_sum(signals: np.ndarray, outputs: np.ndarray) -> int:
+    """Returns the sum of the decoded output ints of all entries."""
+    nums = _decode_all(signals, outputs)
+    failed = np.flatnonzero(nums < 0)
+    if failed.size > 0:
+        raise ValueError(f"failed to decode entry {failed[0]}")
+    return int(nums.sum())
 
 
 def decode(entry: Entry) -> int:
@@ -77,42 +202,7 @@ def decode(entry: Entry) -> int:
         >>> decode(entry)
         5353
     """
-    l = {len(s): set(s) for s in entry.signal} 
-    num = ""
-    for value in entry.output:
-        n_segments = len(value)
-        n_common_4 = len(l[4] & set(value))
-        n_common_1 = len(l[2] & set(value))
-
-        if n_segments == 2:
-            num += "1"
-        elif n_segments == 3:
-            num += "7"
-        elif n_segments == 4:
-            num += "4"
-        elif n_segments == 7:
-            num += "8"
-        elif n_segments == 5:
-            if n_common_4 == 2:
-                num += "2"
-            elif n_common_4 == 3 and n_common_1 == 1:
-                num += "5"
-            elif n_common_4 == 3 and n_common_1 == 2:
-                num += "3" 
-            else:
-                raise ValueError("fail 5", n_segments, n_common_4, n_common_1)
-        elif n_segments == 6:
-            if n_common_4 == 4:
-                num += "9"
-            elif n_common_4 == 3 and n_common_1 == 1:
-                num += "6"
-            elif n_common_4 == 3 and n_common_1 == 2:
-                num += "0"
-            else:
-                raise ValueError("fail 6")
-        else:
-            raise ValueError("fail")
-    return int(num)
+    return output_sum(*encode([entry]))
 
 
 if __name__ == "__main__":
@@ -125,4 +215,4 @@ if __name__ == "__main__":
 
     print(f"part 1: {count_unique(entries)}")
 
-    print(f"part 2: {sum([decode(entry) for entry in entries])}")
+    print(f"part 2: {output_sum(*encode(entries))}")
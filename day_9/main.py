@@ -1,14 +1,15 @@
 import argparse
-import itertools
-from collections import deque
 from functools import reduce
 from operator import mul
 from typing import Iterable
 from typing import List
 from typing import Tuple
 
+import numpy as np
+from scipy.ndimage import label
 
-def parse_input(data: Iterable[str]) -> List[List[int]]:
+
+def parse_input(data: Iterable[str]) -> np.ndarray:
     r"""Returns the heightmap for data.
 
     Example:
@@ -16,30 +17,16 @@ def parse_input(data: Iterable[str]) -> List[List[int]]:
         >>> data = '''2199943210
         ... 3987894921'''.split('\n')
         >>> parse_input(data)
-        [[2, 1, 9, 9, 9, 4, 3, 2, 1, 0], [3, 9, 8, 7, 8, 9, 4, 9, 2, 1]]
+        array([[2, 1, 9, 9, 9, 4, 3, 2, 1, 0],
+               [3, 9, 8, 7, 8, 9, 4, 9, 2, 1]], dtype=int8)
 
     """
-    return [[int(h) for h in line.rstrip()] for line in data]
-
-
-def neighbours(height_map: List[List[int]], position: Tuple[int, int]) -> Iterable[Tuple[int, int]]:
-    """Returns all neighbours at position in height_map."""
-    x, y = position
-    for dx, dy in itertools.product([-1, 0, 1], [-1, 0, 1]):
-        if dx == 0 and dy == 0:
-            continue
-        if not any([dx == 0, dy == 0]):
-            # skip diagonals
-            continue
-        nx, ny = x + dx, y + dy
-        if nx < 0 or nx >= len(height_map[0]):
-            continue
-        if ny < 0 or ny >= len(height_map):
-            continue
-        yield (nx, ny), height_map[ny][nx]
-
-
-def low_points(height_map: List[List[int]]) -> List[Tuple[Tuple[int, int], int]]:
+    lines = [line.rstrip() for line in data]
+    digits = np.frombuffer("".join(lines).encode(), dtype=np.uint8) - ord("0")
+    return digits.reshape(len(lines), -1).astype(np.int8)
+
+
+def low_points(height_map: np.ndarray) -> List[Tuple[Tuple[int, int], int]]:
     r"""Returns the low points ((x, y), height) in height_map.
 
     Example:
@@ -52,19 +39,23 @@ def low_points(height_map: List[List[int]]) -> List[Tuple[Tuple[int, int], int]]
         >>> low_points(height_map)
         [((1, 0), 1), ((9, 0), 0), ((2, 2), 5), ((6, 4), 5)]
     """
-    points = []
-    for y, row in enumerate(height_map):
-        for x, col in enumerate(row):
-            low_point = True
-            for _, val in neighbours(height_map, (x, y)): 
-                low_point &= val > col
-            if low_point:
-                points.append(((x, y), col))
-    return points
+    # pad with a height above any other so edges only compare inwards
+    padded = np.pad(height_map, 1, constant_values=10)
+    centre = padded[1:-1, 1:-1]
+    mask = (
+        (centre < padded[:-2, 1:-1])
+        & (centre < padded[2:, 1:-1])
+        & (centre < padded[1:-1, :-2])
+        & (centre < padded[1:-1, 2:])
+    )
+    ys, xs = np.nonzero(mask)
+    return list(zip(zip(xs.tolist(), ys.tolist()), height_map[mask].tolist()))
     
 
-def basin_size(height_map: List[List[int]], low_point: Tuple[Tuple[int, int], int]) -> int:
-    r"""Returns the size of the basin at low_point.
+def basin_sizes(height_map: np.ndarray) -> np.ndarray:
+    r"""Returns the size of every basin in height_map.
+
+    Basins are the 4-connected regions of locations with height < 9.
 
     Example:
 
@@ -73,22 +64,11 @@ def basin_size(height_map: List[List[int]], low_point: Tuple[Tuple[int, int], in
         ... 9856789892
         ... 8767896789
         ... 9899965678'''.split('\n'))
-        >>> lps = low_points(height_map)
-        >>> [basin_size(height_map, lp) for lp in lps]
-        [3, 9, 14, 9]
+        >>> basin_sizes(height_map)
+        array([ 3,  9, 14,  9])
     """
-    # do a BFS out from low_point
-    visited = set()
-    frontier = deque([low_point])
-    while len(frontier) != 0:
-        current = frontier.popleft()
-        visited.add(current)
-        for neighbour in neighbours(height_map, current[0]):
-            (x, y), val = neighbour
-            if neighbour in visited or val == 9 or val <= current[1]:
-                continue
-            frontier.append(neighbour)
-    return len(visited)
+    labels, _ = label(height_map < 9)
+    return np.bincount(labels.ravel())[1:]
             
     
 if __name__ == "__main__":
@@ -102,6 +82,5 @@ if __name__ == "__main__":
     lps = low_points(height_map)
     print(f"risk sum: {sum([lp[1] + 1 for lp in lps])}")
     
-    basin_sizes = [basin_size(height_map, lp) for lp in lps] 
-    top_three = sorted(basin_sizes)[-3:]
-    print(f"largest 3 basin product: {reduce(mul, top_three, 1)}")
\ No newline at end of file
+    top_three = np.sort(basin_sizes(height_map))[-3:]
+    print(f"largest 3 basin product: {reduce(mul, top_three.tolist(), 1)}")
\ No newline at end of file